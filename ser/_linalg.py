@@ -0,0 +1,490 @@
+"""
+Linear algebra helpers
+
+This module contains the dense linear algebra kernels shared by the SVD
+estimators. It is private; the public API lives in the estimator modules.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+
+import numpy as np
+from scipy.linalg import eigh, qr, svd
+from scipy.linalg.blas import get_blas_funcs
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # threadpoolctl is optional
+    threadpool_limits = None
+
+# Rows per block when local statistics are computed block by block
+_BLOCK_ROWS = 4096
+
+# Partitions with fewer elements in total are processed serially, since a
+# thread pool would cost more than it saves
+_MIN_PARALLEL_SIZE = 1 << 18
+
+
+@contextmanager
+def partition_executor(partitions):
+    """
+    Provide a thread pool for processing data partitions concurrently.
+
+    LAPACK and BLAS release the GIL, so per-partition linear algebra runs
+    concurrently. When threadpoolctl is installed, the BLAS thread count is
+    limited while the pool is active to avoid oversubscribing the CPU.
+    Starting the pool and changing the limits have a fixed cost, so the
+    context is meant to be entered once per fit, and yields None (serial
+    processing) when there is a single worker or little data.
+
+    Parameters
+    ----------
+    partitions : list of ndarray
+        Data partitions that will be processed
+
+    Yields
+    ------
+    executor : ThreadPoolExecutor or None
+        Pool to pass to map_partitions
+    """
+    partitions = list(partitions)
+    n_cpus = os.cpu_count() or 1
+    n_workers = min(len(partitions), n_cpus)
+    total_size = sum(X.size for X in partitions)
+
+    if n_workers <= 1 or total_size < _MIN_PARALLEL_SIZE:
+        yield None
+        return
+
+    if threadpool_limits is None:
+        limits = nullcontext()
+    else:
+        limits = threadpool_limits(limits=max(1, n_cpus // n_workers),
+                                   user_api='blas')
+
+    with limits, ThreadPoolExecutor(max_workers=n_workers) as executor:
+        yield executor
+
+
+def map_partitions(func, partitions, executor=None):
+    """
+    Apply a function to each data partition.
+
+    Parameters
+    ----------
+    func : callable
+        Function applied to each partition
+    partitions : list
+        Data partitions
+    executor : ThreadPoolExecutor, optional (default=None)
+        Pool from partition_executor. If None, partitions are processed
+        serially.
+
+    Returns
+    -------
+    results : list
+        Results of func, in the same order as partitions
+    """
+    if executor is None:
+        return [func(X) for X in partitions]
+
+    return list(executor.map(func, partitions))
+
+def randomized_svd(A, n_components, n_oversamples=10, n_iter=2,
+                   random_state=None):
+    """
+    Compute a truncated SVD with a randomized range finder.
+
+    Only the leading ``n_components`` singular triplets are computed, which
+    is much cheaper than a full SVD when ``n_components`` is small compared
+    to ``min(A.shape)``.
+
+    Parameters
+    ----------
+    A : ndarray, shape (m, n)
+        Matrix to decompose
+    n_components : int
+        Number of singular values/vectors to compute
+    n_oversamples : int, optional (default=10)
+        Additional random directions used to improve the approximation
+    n_iter : int, optional (default=2)
+        Number of power iterations
+    random_state : int, Generator or None, optional (default=None)
+        Seed for the random test matrix
+
+    Returns
+    -------
+    U : ndarray, shape (m, n_components)
+        Left singular vectors
+    s : ndarray, shape (n_components,)
+        Singular values in descending order
+    Vt : ndarray, shape (n_components, n)
+        Right singular vectors (transposed)
+    """
+    m, n = A.shape
+    n_random = min(n_components + n_oversamples, m, n)
+    rng = np.random.default_rng(random_state)
+
+    # Sample the range of A and refine it with a few power iterations,
+    # re-orthonormalizing at each step to keep the basis well conditioned
+    Q = A @ rng.standard_normal((n, n_random)).astype(A.dtype, copy=False)
+    for _ in range(n_iter):
+        Q, _ = qr(Q, mode='economic')
+        Q, _ = qr(A.T @ Q, mode='economic')
+        Q = A @ Q
+    Q, _ = qr(Q, mode='economic')
+
+    # Small SVD of the projection onto the sampled range
+    U_small, s, Vt = svd(Q.T @ A, full_matrices=False)
+    U = Q @ U_small
+
+    return U[:, :n_components], s[:n_components], Vt[:n_components, :]
+
+
+def gram(X):
+    """
+    Compute the Gram matrix X^T X with a symmetric rank-k update (SYRK).
+
+    SYRK exploits the symmetry of the result and needs half the flops of a
+    general matrix product. Only the upper triangle of the result is
+    written; the strictly lower triangle is zero.
+
+    Parameters
+    ----------
+    X : ndarray, shape (m, n)
+        Input matrix
+
+    Returns
+    -------
+    C : ndarray, shape (n, n)
+        Upper triangle of X^T X
+    """
+    if X.shape[0] == 0:
+        # BLAS rejects empty operands
+        return np.zeros((X.shape[1], X.shape[1]), dtype=X.dtype, order='F')
+
+    syrk = get_blas_funcs('syrk', (X,))
+
+    # Pick the orientation that BLAS can read without copying X
+    if X.flags.f_contiguous:
+        return syrk(1.0, X, trans=1, lower=0)
+    return syrk(1.0, X.T, trans=0, lower=0)
+
+
+def gram_svd(X, n_components=None):
+    """
+    Compute singular values and right singular vectors from X^T X.
+
+    For tall-skinny X the eigendecomposition of the n x n Gram matrix is
+    considerably cheaper than an SVD of X, since C = V S^2 V^T. Left
+    singular vectors are not computed.
+
+    Forming C squares the condition number, so singular values below
+    about eps**0.5 times the largest one lose their accuracy. When the
+    computed spectrum spans that range, an SVD of X is used instead.
+
+    Parameters
+    ----------
+    X : ndarray, shape (m, n)
+        Input matrix, ideally with m >= n
+    n_components : int, optional (default=None)
+        Number of leading components to compute. If None, computes all.
+
+    Returns
+    -------
+    s : ndarray
+        Singular values in descending order
+    Vt : ndarray
+        Right singular vectors (transposed)
+    """
+    C = gram(X)
+    n = C.shape[0]
+    k = n if n_components is None else min(n_components, n)
+
+    # eigh returns eigenvalues in ascending order; only the top k are needed
+    eigenvalues, eigenvectors = eigh(C, lower=False, overwrite_a=True,
+                                     subset_by_index=[n - k, n - 1])
+
+    if eigenvalues[0] <= np.sqrt(np.finfo(C.dtype).eps) * eigenvalues[-1]:
+        _, s, Vt = svd(X, full_matrices=False, lapack_driver='gesdd')
+        return s[:k], Vt[:k]
+
+    s = np.sqrt(np.maximum(eigenvalues[::-1], 0))
+    Vt = eigenvectors[:, ::-1].T
+
+    return s, Vt
+
+
+def local_statistics(X):
+    """
+    Compute the column sums and the scatter matrix of a partition.
+
+    The scatter matrix sum_i (x_i - m)(x_i - m)^T is taken about the local
+    mean m and returned in float64. Double precision input keeps enough
+    digits to center after a single SYRK. Single precision input would
+    lose most of them to cancellation, so it is shifted by a value close
+    to its mean first; the shifted rows are processed in blocks that stay
+    in cache, which lets the sum and a single precision SYRK share one
+    pass over X. Only the upper triangle is filled, in Fortran order.
+
+    Parameters
+    ----------
+    X : ndarray, shape (m, n)
+        Input matrix
+
+    Returns
+    -------
+    local_sum : ndarray, shape (n,)
+        Column sums of X, in float64
+    local_scatter : ndarray, shape (n, n)
+        Upper triangle of the scatter matrix about the local mean, in
+        float64
+    """
+    n_samples, n_features = X.shape
+    if n_samples == 0:
+        return (np.zeros(n_features),
+                np.zeros((n_features, n_features), order='F'))
+
+    if X.dtype == np.float64:
+        shift = np.zeros(n_features)
+        shifted_sum = np.sum(X, axis=0)
+        local_scatter = gram(X)
+    else:
+        # Any shift near the mean avoids the cancellation; the first block
+        # provides one without an extra pass over X
+        shift = X[:_BLOCK_ROWS].mean(axis=0, dtype=np.float64)
+        shift = shift.astype(X.dtype)
+        shifted_sum = np.zeros(n_features)
+        local_scatter = np.zeros((n_features, n_features), dtype=X.dtype,
+                                 order='F')
+        syrk = get_blas_funcs('syrk', (local_scatter,))
+        buffer = np.empty((min(_BLOCK_ROWS, n_samples), n_features),
+                          dtype=X.dtype)
+        for start in range(0, n_samples, _BLOCK_ROWS):
+            X_block = X[start:start + _BLOCK_ROWS]
+            block = np.subtract(X_block, shift, out=buffer[:len(X_block)])
+            shifted_sum += np.sum(block, axis=0, dtype=np.float64)
+            local_scatter = syrk(1.0, block.T, beta=1.0, c=local_scatter,
+                                 trans=0, lower=0, overwrite_c=1)
+        local_scatter = local_scatter.astype(np.float64, order='F')
+
+    # Move the scatter matrix from the shift to the local mean
+    syr = get_blas_funcs('syr', (local_scatter,))
+    local_scatter = syr(-1.0 / n_samples, shifted_sum, a=local_scatter,
+                        lower=0, overwrite_a=1)
+    local_sum = shifted_sum + n_samples * shift.astype(np.float64)
+
+    return local_sum, local_scatter
+
+def gemm_bias(A, B, bias):
+    """
+    Compute A @ B + bias with a single GEMM call.
+
+    The output is prefilled with the broadcast bias and GEMM accumulates
+    into it (beta=1), so the product and the addition share one pass over
+    the output.
+
+    Parameters
+    ----------
+    A : ndarray, shape (m, k) or (k,)
+        Left operand
+    B : ndarray, shape (k, n)
+        Right operand
+    bias : ndarray, shape (n,)
+        Row vector added to every row of the product
+
+    Returns
+    -------
+    C : ndarray, shape (m, n) or (n,)
+        C-contiguous result, 1-D if A is 1-D
+    """
+    if A.ndim == 1:
+        return gemm_bias(A[None, :], B, bias)[0]
+    if A.size == 0 or B.size == 0:
+        # BLAS rejects empty operands
+        return A @ B + bias
+
+    out = np.empty((A.shape[0], B.shape[1]), dtype=np.result_type(A, B))
+    np.copyto(out, bias)
+    gemm = get_blas_funcs('gemm', (A, B, out))
+
+    # BLAS is column-major: compute out^T = B^T A^T, whose operands are
+    # Fortran-ordered views of the C-ordered inputs, so nothing is copied
+    out_t = gemm(1.0, B.T, A.T, beta=1.0, c=out.T, overwrite_c=1)
+
+    return out_t.T
+
+
+def center_project(X, V, mean, mean_proj):
+    """
+    Compute the projection (X - mean) @ V of data onto a basis.
+
+    In double precision, centering is folded into the precomputed
+    projection of the mean, X @ V - mean @ V, so X is only read once. In
+    lower precision that difference cancels when the mean is large
+    compared to the spread of X, so X is centered explicitly.
+
+    Parameters
+    ----------
+    X : ndarray, shape (m, n)
+        Data to project
+    V : ndarray, shape (n, k)
+        Basis
+    mean : ndarray, shape (n,)
+        Mean to subtract from X
+    mean_proj : ndarray, shape (k,)
+        Precomputed mean @ V
+
+    Returns
+    -------
+    X_projected : ndarray, shape (m, k)
+        Projected data
+    """
+    if X.dtype == np.float64:
+        X_projected = X @ V
+        X_projected -= mean_proj
+        return X_projected
+
+    return (X - mean) @ V
+
+
+def compute_U(transform, X_partitions, s, dtype, out=None):
+    """
+    Compute the left singular vectors U = (X - mean) V S^-1.
+
+    Columns for zero singular values are left at zero.
+
+    U is filled one row block per partition, so the partitions are never
+    concatenated. Each block is scaled before it is written, which keeps
+    writes to memory-mapped outputs to a single pass.
+
+    Parameters
+    ----------
+    transform : callable
+        Fitted projection X -> (X - mean) V of the estimator
+    X_partitions : list of ndarray
+        Data partitions, in the order their rows appear in U
+    s : ndarray, shape (n_components,)
+        Singular values
+    dtype : data-type
+        Data type of U when out is None
+    out : array-like, optional (default=None)
+        Preallocated output of shape (n_samples, n_components), e.g. a
+        np.memmap or an HDF5 dataset. If None, a new array is used.
+
+    Returns
+    -------
+    U : array-like, shape (n_samples, n_components)
+        Left singular vectors
+    """
+    total_samples = sum(X.shape[0] for X in X_partitions)
+    shape = (total_samples, len(s))
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif tuple(out.shape) != shape:
+        raise ValueError(
+            f"out_U has shape {tuple(out.shape)}, expected {shape}."
+        )
+
+    # Null components (s == 0) of rank-deficient data get zero columns
+    inv_s = np.zeros_like(s)
+    np.divide(1.0, s, out=inv_s, where=s != 0)
+    offset = 0
+    for X in X_partitions:
+        U_block = transform(X)
+        U_block *= inv_s
+        out[offset:offset + X.shape[0]] = U_block
+        offset += X.shape[0]
+
+    return out
+
+
+def check_backend(backend):
+    """
+    Validate the name of a compute backend.
+
+    Parameters
+    ----------
+    backend : str
+        Either 'cpu' or 'cuda'
+
+    Raises
+    ------
+    ValueError
+        If the backend is not supported
+    """
+    if backend not in ('cpu', 'cuda'):
+        raise ValueError(
+            f"backend must be 'cpu' or 'cuda', got {backend!r}."
+        )
+
+
+def _import_torch():
+    """Import PyTorch, which is only required for the 'cuda' backend."""
+    try:
+        import torch
+    except ImportError as exc:
+        raise ImportError(
+            "backend='cuda' requires PyTorch with CUDA support."
+        ) from exc
+    return torch
+
+
+def cuda_svd(A):
+    """
+    Compute singular values and right singular vectors on the GPU.
+
+    Only the small results (s and Vt) are copied back to host memory.
+
+    Parameters
+    ----------
+    A : ndarray, shape (m, n)
+        Matrix to decompose
+
+    Returns
+    -------
+    s : ndarray
+        Singular values in descending order
+    Vt : ndarray
+        Right singular vectors (transposed)
+    """
+    torch = _import_torch()
+    A_gpu = torch.as_tensor(A, device='cuda', dtype=torch.float32)
+    _, s, Vt = torch.linalg.svd(A_gpu, full_matrices=False)
+
+    return (s.cpu().numpy().astype(A.dtype, copy=False),
+            Vt.cpu().numpy().astype(A.dtype, copy=False))
+
+
+def cuda_eigh(C, eigvals_only=False):
+    """
+    Compute the eigendecomposition of a symmetric matrix on the GPU.
+
+    Only the upper triangle of C is read.
+
+    Parameters
+    ----------
+    C : ndarray, shape (n, n)
+        Symmetric matrix
+    eigvals_only : bool, optional (default=False)
+        Whether to compute only the eigenvalues
+
+    Returns
+    -------
+    eigenvalues : ndarray
+        Eigenvalues in ascending order
+    eigenvectors : ndarray
+        Corresponding eigenvectors, one per column. Not returned if
+        eigvals_only is True.
+    """
+    torch = _import_torch()
+    C_gpu = torch.as_tensor(C, device='cuda', dtype=torch.float32)
+    if eigvals_only:
+        eigenvalues = torch.linalg.eigvalsh(C_gpu, UPLO='U')
+        return eigenvalues.cpu().numpy().astype(C.dtype, copy=False)
+
+    eigenvalues, eigenvectors = torch.linalg.eigh(C_gpu, UPLO='U')
+
+    return (eigenvalues.cpu().numpy().astype(C.dtype, copy=False),
+            eigenvectors.cpu().numpy().astype(C.dtype, copy=False))
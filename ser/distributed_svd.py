@@ -6,7 +6,11 @@ that can work with data split across multiple nodes or partitions.
 """
 
 import numpy as np
-from scipy.linalg import svd
+from scipy.linalg import qr, svd
+
+from ._linalg import (center_project, check_backend, compute_U, cuda_svd,
+                      gemm_bias, gram_svd, map_partitions,
+                      partition_executor, randomized_svd)
 
 
 class DistributedSVD:
@@ -20,7 +24,24 @@ class DistributedSVD:
     Parameters
     ----------
     n_components : int, optional (default=None)
-        Number of singular values/vectors to compute. If None, computes all.
+        Number of singular values/vectors to keep. If None, keeps all.
+        Every partition always contributes all of its components, so the
+        result matches an SVD of the pooled data; only the global
+        decomposition is truncated.
+    svd_solver : {'full', 'randomized'}, optional (default='full')
+        How the global decomposition is computed. 'full' is an exact SVD.
+        'randomized' uses a randomized SVD of the leading n_components
+        (ignored if n_components is None); it is faster for many features
+        but approximate, and depends on random_state.
+    random_state : int or None, optional (default=None)
+        Seed for svd_solver='randomized'
+    backend : {'cpu', 'cuda'}, optional (default='cpu')
+        Where the SVD of the combined matrix is computed. 'cuda' runs it on
+        the GPU in single precision and requires PyTorch.
+    dtype : data-type, optional (default=np.float64)
+        Floating point type used for the computation and the fitted
+        attributes. np.float32 is about twice as fast when its precision
+        is sufficient.
     
     Attributes
     ----------
@@ -30,16 +51,28 @@ class DistributedSVD:
         Singular values in descending order
     Vt_ : ndarray
         Right singular vectors (transposed) of shape (n_components, n_features)
+    V_ : ndarray
+        Contiguous copy of Vt_.T, used to project data in transform
+    mean_proj_ : ndarray
+        Projection of the mean onto V_, used to center float64 data in
+        transform
     """
     
-    def __init__(self, n_components=None):
+    def __init__(self, n_components=None, random_state=None, backend='cpu',
+                 dtype=np.float64, svd_solver='full'):
         self.n_components = n_components
+        self.svd_solver = svd_solver
+        self.random_state = random_state
+        self.backend = backend
+        self.dtype = dtype
         self.U_ = None
         self.s_ = None
         self.Vt_ = None
+        self.V_ = None
+        self.mean_proj_ = None
         self.mean_ = None
     
-    def fit(self, X_partitions):
+    def fit(self, X_partitions, out_U=None, skip_U=False):
         """
         Fit the Distributed SVD model.
         
@@ -48,58 +81,147 @@ class DistributedSVD:
         X_partitions : list of array-like
             List of data partitions, each of shape (n_samples_i, n_features).
             Each partition represents data on a different node.
+        out_U : array-like, optional (default=None)
+            Preallocated output for U_ of shape (n_samples, n_components),
+            e.g. a np.memmap or an HDF5 dataset for data larger than
+            memory. U_ is written into it block by block.
+        skip_U : bool, optional (default=False)
+            If True, U_ is not computed and is left as None. Use this when
+            only s_ and Vt_ are needed.
             
         Returns
         -------
         self : object
             Returns self
         """
+        check_backend(self.backend)
+        if self.svd_solver not in ('full', 'randomized'):
+            raise ValueError(
+                "svd_solver must be 'full' or 'randomized', "
+                f"got {self.svd_solver!r}."
+            )
+        
         # Convert all partitions to arrays
-        X_partitions = [np.asarray(X) for X in X_partitions]
+        X_partitions = [np.asarray(X, dtype=self.dtype) for X in X_partitions]
         
-        # Compute global mean
+        # Compute global mean (accumulated in float64 for accuracy)
         total_samples = sum(X.shape[0] for X in X_partitions)
-        self.mean_ = sum(np.sum(X, axis=0) for X in X_partitions) / total_samples
+        global_sum = sum(np.sum(X, axis=0, dtype=np.float64)
+                         for X in X_partitions)
+        self.mean_ = (global_sum / total_samples).astype(self.dtype)
         
         # Center each partition
         X_centered = [X - self.mean_ for X in X_partitions]
         
-        # Step 1: Compute local SVDs on each partition
-        local_svds = []
-        for X in X_centered:
-            if X.shape[0] > 0:  # Check partition is not empty
-                U_local, s_local, Vt_local = svd(X, full_matrices=False)
-                local_svds.append((U_local, s_local, Vt_local))
+        # Step 1: Compute local SVDs on each partition in parallel
+        # Each node returns all of its components; truncating them here
+        # would make the global result approximate
+        X_nonempty = [X for X in X_centered if X.shape[0] > 0]
+        with partition_executor(X_nonempty) as executor:
+            local_svds = map_partitions(self._local_svd, X_nonempty,
+                                        executor)
         
         # Step 2: Combine the right singular vectors (Vt)
         # Weight by singular values and concatenate
         weighted_Vt = []
-        for U_local, s_local, Vt_local in local_svds:
-            # Weight Vt by singular values
-            weighted_Vt.append(np.diag(s_local) @ Vt_local)
+        for s_local, Vt_local in local_svds:
+            # Weight Vt by singular values (row scaling, no diagonal matrix)
+            weighted_Vt.append(s_local[:, None] * Vt_local)
         
         # Stack all weighted Vt matrices
         combined_Vt = np.vstack(weighted_Vt)
         
         # Step 3: Compute SVD of the combined matrix to get global Vt
-        U_global, s_global, Vt_global = svd(combined_Vt, full_matrices=False)
+        # combined_Vt is a temporary, so LAPACK may reuse its buffer
+        if self.backend == 'cuda':
+            s_global, Vt_global = cuda_svd(combined_Vt)
+        elif combined_Vt.shape[0] > combined_Vt.shape[1]:
+            # Tall-skinny (many partitions): QR first, then the small SVD of
+            # the (n_features, n_features) triangular factor, which has the
+            # same singular values and right singular vectors. mode='r'
+            # returns R zero-padded to the full height, so keep its top rows
+            n_features = combined_Vt.shape[1]
+            R = qr(combined_Vt, mode='r', overwrite_a=True)[0][:n_features]
+            s_global, Vt_global = self._svd(R, overwrite_a=True)
+        else:
+            s_global, Vt_global = self._svd(combined_Vt, overwrite_a=True)
         
         # Step 4: Keep only n_components if specified
         if self.n_components is not None:
             s_global = s_global[:self.n_components]
             Vt_global = Vt_global[:self.n_components, :]
-            U_global = U_global[:, :self.n_components]
         
         self.s_ = s_global
-        self.Vt_ = Vt_global
+        self.Vt_ = np.ascontiguousarray(Vt_global)
+        self.V_ = np.ascontiguousarray(self.Vt_.T)
+        self.mean_proj_ = self.mean_ @ self.V_
         
         # Step 5: Compute global U by projecting original data
-        # Concatenate all partitions
-        X_full = np.vstack(X_centered)
-        self.U_ = X_full @ Vt_global.T / s_global
+        del X_centered
+        self.U_ = None
+        if not skip_U:
+            self.U_ = compute_U(self.transform, X_partitions, self.s_,
+                                self.dtype, out=out_U)
         
         return self
     
+    def _local_svd(self, X):
+        """
+        Compute the local SVD of a single centered partition.
+        
+        Partitions are usually tall-skinny, in which case the
+        eigendecomposition of the Gram matrix X^T X is used instead of an
+        SVD of X (the same identity FederatedSVD relies on).
+        
+        Parameters
+        ----------
+        X : ndarray, shape (n_samples_i, n_features)
+            Centered partition
+            
+        Returns
+        -------
+        s : ndarray
+            Singular values in descending order
+        Vt : ndarray
+            Right singular vectors (transposed)
+        """
+        if X.shape[0] >= X.shape[1]:
+            return gram_svd(X)
+        
+        _, s, Vt = svd(X, full_matrices=False, lapack_driver='gesdd')
+        return s, Vt
+    
+    def _svd(self, X, overwrite_a=False):
+        """
+        Compute the singular values and right singular vectors of X.
+        
+        With svd_solver='randomized' and n_components set, only the leading
+        n_components are computed. Left singular vectors are not needed by
+        the distributed algorithm and are discarded.
+        
+        Parameters
+        ----------
+        X : ndarray
+            Matrix to decompose
+        overwrite_a : bool, optional (default=False)
+            Whether LAPACK may overwrite X (full SVD only)
+            
+        Returns
+        -------
+        s : ndarray
+            Singular values in descending order
+        Vt : ndarray
+            Right singular vectors (transposed)
+        """
+        if self.svd_solver == 'full' or self.n_components is None:
+            _, s, Vt = svd(X, full_matrices=False, lapack_driver='gesdd',
+                           overwrite_a=overwrite_a)
+            return s, Vt
+        
+        _, s, Vt = randomized_svd(X, self.n_components, n_oversamples=10,
+                                  n_iter=2, random_state=self.random_state)
+        return s, Vt
+    
     def transform(self, X):
         """
         Transform data using the fitted distributed SVD.
@@ -114,11 +236,10 @@ class DistributedSVD:
         X_transformed : ndarray, shape (n_samples, n_components)
             Transformed data
         """
-        X = np.asarray(X)
-        X_centered = X - self.mean_
+        X = np.asarray(X, dtype=self.dtype)
         
-        # Project onto right singular vectors
-        X_transformed = X_centered @ self.Vt_.T
+        # Project onto the right singular vectors
+        X_transformed = center_project(X, self.V_, self.mean_, self.mean_proj_)
         
         return X_transformed
     
@@ -138,9 +259,19 @@ class DistributedSVD:
         """
         self.fit(X_partitions)
         
-        # Transform all partitions and concatenate
-        X_full = np.vstack([np.asarray(X) for X in X_partitions])
-        return self.transform(X_full)
+        # U_ holds the centered projections scaled by 1 / s_, so the
+        # partitions do not need to be projected a second time.
+        # U_ is zero for null components of rank-deficient data; those
+        # columns are filled with a direct projection
+        X_transformed = self.U_ * self.s_
+        
+        null = self.s_ == 0
+        if np.any(null):
+            X_full = np.vstack([np.asarray(X, dtype=self.dtype)
+                                for X in X_partitions])
+            X_transformed[:, null] = self.transform(X_full)[:, null]
+        
+        return X_transformed
     
     def inverse_transform(self, X_transformed):
         """
@@ -156,10 +287,10 @@ class DistributedSVD:
         X : ndarray, shape (n_samples, n_features)
             Data in original space
         """
-        X_transformed = np.asarray(X_transformed)
+        X_transformed = np.asarray(X_transformed, dtype=self.dtype)
         
-        # Project back using Vt
-        X = X_transformed @ self.Vt_ + self.mean_
+        # Project back using Vt, adding the mean inside the same GEMM
+        X = gemm_bias(X_transformed, self.Vt_, self.mean_)
         
         return X
     
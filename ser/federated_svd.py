@@ -7,7 +7,12 @@ are shared.
 """
 
 import numpy as np
-from scipy.linalg import svd
+from scipy.linalg import eigh, qr, svd
+from scipy.linalg.blas import get_blas_funcs
+
+from ._linalg import (center_project, check_backend, compute_U, cuda_eigh,
+                      gemm_bias, local_statistics, map_partitions,
+                      partition_executor)
 
 
 class FederatedSVD:
@@ -23,7 +28,30 @@ class FederatedSVD:
     n_components : int, optional (default=None)
         Number of singular values/vectors to compute. If None, computes all.
     n_iterations : int, optional (default=10)
-        Number of federated averaging iterations
+        Number of federated averaging iterations. With method='sketch',
+        this is the number of subspace iteration rounds (one more round is
+        used for the final projection).
+    method : {'covariance', 'sketch'}, optional (default='covariance')
+        'covariance' aggregates the full (n_features, n_features)
+        covariance of every node. 'sketch' runs a federated randomized
+        subspace iteration: nodes only exchange (n_features, d) products
+        with a shared sketch of d = n_components + 10 columns, which cuts
+        communication from O(n_features^2) to O(n_features * d) per node.
+    random_state : int or None, optional (default=None)
+        Seed for the random sketch used by method='sketch'
+    init_V : array-like of shape (n_features, j), optional (default=None)
+        Warm start for method='sketch', e.g. the V_ (or Vt_.T) of a
+        previous fit. Its columns seed the sketch, and random columns are
+        added up to the sketch width. Starting near the solution needs
+        far fewer iterations. Other methods raise a ValueError if it is set.
+    backend : {'cpu', 'cuda'}, optional (default='cpu')
+        Where the eigendecomposition of the global covariance is computed.
+        'cuda' runs it on the GPU in single precision and requires PyTorch.
+    dtype : data-type, optional (default=np.float64)
+        Floating point type used for the computation and the fitted
+        attributes. With np.float32 the per-node products run in single
+        precision, which is faster, while the statistics are centered and
+        merged in float64.
     
     Attributes
     ----------
@@ -33,14 +61,28 @@ class FederatedSVD:
         Singular values in descending order
     Vt_ : ndarray
         Right singular vectors (transposed)
+    V_ : ndarray
+        Contiguous copy of Vt_.T, used to project data in transform
+    mean_proj_ : ndarray
+        Projection of the mean onto V_, used to center float64 data in
+        transform
     """
     
-    def __init__(self, n_components=None, n_iterations=10):
+    def __init__(self, n_components=None, n_iterations=10, backend='cpu',
+                 dtype=np.float64, method='covariance', random_state=None,
+                 init_V=None):
         self.n_components = n_components
         self.n_iterations = n_iterations
+        self.method = method
+        self.random_state = random_state
+        self.init_V = init_V
+        self.backend = backend
+        self.dtype = dtype
         self.U_ = None
         self.s_ = None
         self.Vt_ = None
+        self.V_ = None
+        self.mean_proj_ = None
         self.mean_ = None
     
     def _compute_local_statistics(self, X):
@@ -57,15 +99,13 @@ class FederatedSVD:
         stats : dict
             Dictionary containing local statistics
         """
-        X = np.asarray(X)
+        X = np.asarray(X, dtype=self.dtype)
         n_samples = X.shape[0]
         
-        # Compute local sum and count for mean calculation
-        local_sum = np.sum(X, axis=0)
-        
-        # Compute local covariance contribution
-        # C = X^T X (for centered data, but we'll center after aggregation)
-        local_cov = X.T @ X
+        # Compute local sum (for the mean) and the covariance contribution
+        # about the local mean, both returned in float64; only the upper
+        # triangle of the covariance is computed, the rest is zero
+        local_sum, local_cov = local_statistics(X)
         
         return {
             'n_samples': n_samples,
@@ -89,15 +129,26 @@ class FederatedSVD:
         """
         total_samples = sum(stats['n_samples'] for stats in local_stats_list)
         
-        # Compute global mean
-        global_sum = sum(stats['local_sum'] for stats in local_stats_list)
+        # Compute global mean (sums and covariances are in float64)
+        global_sum = np.zeros_like(local_stats_list[0]['local_sum'])
+        for stats in local_stats_list:
+            global_sum += stats['local_sum']
         global_mean = global_sum / total_samples
         
-        # Compute global covariance (we'll need to adjust for mean)
-        global_cov = sum(stats['local_cov'] for stats in local_stats_list)
-        
-        # Adjust for centering: subtract n * mean * mean^T
-        global_cov = global_cov - total_samples * np.outer(global_mean, global_mean)
+        # Merge the covariances about the local means in place into a single
+        # buffer (parallel-axis update): add n_i * d_i d_i^T for the offset
+        # d_i of each local mean from the global mean, as a symmetric
+        # rank-1 update (SYR) on the stored upper triangle
+        global_cov = np.zeros_like(local_stats_list[0]['local_cov'],
+                                   order='F')
+        syr = get_blas_funcs('syr', (global_cov,))
+        for stats in local_stats_list:
+            n_samples = stats['n_samples']
+            global_cov += stats['local_cov']
+            if n_samples > 0:
+                offset = stats['local_sum'] / n_samples - global_mean
+                global_cov = syr(n_samples, offset, a=global_cov, lower=0,
+                                 overwrite_a=1)
         
         return {
             'mean': global_mean,
@@ -105,59 +156,318 @@ class FederatedSVD:
             'n_samples': total_samples
         }
     
-    def fit(self, X_nodes):
+    def _fit_covariance(self, X_nodes, compute_uv=True):
         """
-        Fit the Federated SVD model.
+        Compute the top eigenpairs of the global covariance matrix.
+        
+        Each node shares its full local covariance contribution.
         
         Parameters
         ----------
-        X_nodes : list of array-like
-            List of data on each node, each of shape (n_samples_i, n_features).
-            Data remains on each node and only statistics are aggregated.
+        X_nodes : list of ndarray
+            Data on each node
+        compute_uv : bool, optional (default=True)
+            If False, only the eigenvalues are computed
             
         Returns
         -------
-        self : object
-            Returns self
+        eigenvalues : ndarray
+            Eigenvalues in descending order
+        eigenvectors : ndarray or None
+            Corresponding eigenvectors, one per column
         """
-        # Step 1: Each node computes local statistics
-        local_stats = [self._compute_local_statistics(X) for X in X_nodes]
+        # Step 1: Each node computes local statistics (concurrently)
+        with partition_executor(X_nodes) as executor:
+            local_stats = map_partitions(self._compute_local_statistics,
+                                         X_nodes, executor)
         
         # Step 2: Aggregate statistics at central server
         global_stats = self._aggregate_statistics(local_stats)
         
-        self.mean_ = global_stats['mean']
+        self.mean_ = global_stats['mean'].astype(self.dtype)
         global_cov = global_stats['cov']
         
         # Step 3: Compute SVD of the covariance matrix
         # For covariance matrix C = X^T X, the SVD gives us V and singular values
         # Since C = V S^2 V^T, we can get V and s from eigendecomposition
-        eigenvalues, eigenvectors = np.linalg.eigh(global_cov)
+        # Only the upper triangle of the covariance is stored, and only the
+        # top n_components eigenpairs are computed
+        n_features = global_cov.shape[0]
+        k = n_features
+        if self.n_components is not None:
+            k = min(self.n_components, n_features)
+        if not compute_uv:
+            if self.backend == 'cuda':
+                eigenvalues = cuda_eigh(global_cov, eigvals_only=True)
+                eigenvalues = eigenvalues[n_features - k:]
+            else:
+                eigenvalues = eigh(
+                    global_cov, lower=False, eigvals_only=True,
+                    subset_by_index=[n_features - k, n_features - 1]
+                )
+            return eigenvalues[::-1].astype(self.dtype), None
+        
+        if self.backend == 'cuda':
+            eigenvalues, eigenvectors = cuda_eigh(global_cov)
+            eigenvalues = eigenvalues[n_features - k:]
+            eigenvectors = eigenvectors[:, n_features - k:]
+        else:
+            eigenvalues, eigenvectors = eigh(
+                global_cov, lower=False,
+                subset_by_index=[n_features - k, n_features - 1]
+            )
+        
+        # eigh returns ascending order; reverse with views instead of sorting
+        # and return the float64 results in the requested dtype
+        eigenvalues = eigenvalues[::-1].astype(self.dtype)
+        eigenvectors = eigenvectors[:, ::-1].astype(self.dtype)
+        
+        return eigenvalues, eigenvectors
+    
+    def _prepare_sketch_node(self, X):
+        """
+        Prepare a data partition for the sketch rounds.
         
-        # Sort by eigenvalues in descending order
-        idx = np.argsort(eigenvalues)[::-1]
-        eigenvalues = eigenvalues[idx]
-        eigenvectors = eigenvectors[:, idx]
+        Single precision data is shifted once by its rounded local mean,
+        so that the products of every round are computed on nearly
+        centered data and do not cancel; this keeps a shifted copy of the
+        partition on the node. Double precision data is used as is.
         
-        # Singular values are square roots of eigenvalues
-        singular_values = np.sqrt(np.maximum(eigenvalues, 0))
+        Parameters
+        ----------
+        X : ndarray
+            Local data partition
+            
+        Returns
+        -------
+        node : dict
+            Local sample count, column sums (in float64), shift (in
+            float64) and shifted data
+        """
+        n_samples, n_features = X.shape
+        local_sum = np.sum(X, axis=0, dtype=np.float64)
+        shift = np.zeros(n_features)
+        if X.dtype != np.float64 and n_samples > 0:
+            shift = (local_sum / n_samples).astype(X.dtype)
+            X = X - shift
+            shift = shift.astype(np.float64)
+        
+        return {
+            'n_samples': n_samples,
+            'local_sum': local_sum,
+            'shift': shift,
+            'X': X
+        }
+    
+    def _compute_local_sketch(self, node, Q):
+        """
+        Compute local statistics for a data partition against a sketch.
+        
+        Parameters
+        ----------
+        node : dict
+            Prepared local data partition
+        Q : ndarray, shape (n_features, d)
+            Orthonormal sketch broadcast by the server, in float64
+            
+        Returns
+        -------
+        stats : dict
+            Dictionary containing local statistics; local_proj is the
+            covariance about the local mean applied to Q, in float64
+        """
+        X = node['X']
+        n_samples = node['n_samples']
+        
+        # X^T X Q without forming X^T X, shape (n_features, d)
+        local_proj = X.T @ (X @ Q.astype(X.dtype))
+        local_proj = local_proj.astype(np.float64)
+        
+        # Move from the shift to the local mean
+        if n_samples > 0:
+            offset = node['local_sum'] / n_samples - node['shift']
+            local_proj -= n_samples * np.outer(offset, offset @ Q)
+        
+        return {
+            'n_samples': n_samples,
+            'local_sum': node['local_sum'],
+            'local_proj': local_proj
+        }
+    
+    def _aggregate_sketch(self, local_stats_list, Q):
+        """
+        Aggregate sketched statistics from all nodes.
+        
+        Parameters
+        ----------
+        local_stats_list : list of dict
+            List of local sketch statistics from each node
+        Q : ndarray, shape (n_features, d)
+            Sketch the statistics were computed against
+            
+        Returns
+        -------
+        global_stats : dict
+            Global mean and the centered covariance applied to Q, in
+            float64
+        """
+        total_samples = sum(stats['n_samples'] for stats in local_stats_list)
+        
+        global_sum = np.zeros_like(local_stats_list[0]['local_sum'])
+        for stats in local_stats_list:
+            global_sum += stats['local_sum']
+        global_mean = global_sum / total_samples
+        
+        # Merge the products about the local means (parallel-axis update):
+        # add n_i * d_i (d_i^T Q) for the offset d_i of each local mean
+        # from the global mean
+        global_proj = np.zeros_like(local_stats_list[0]['local_proj'])
+        for stats in local_stats_list:
+            n_samples = stats['n_samples']
+            global_proj += stats['local_proj']
+            if n_samples > 0:
+                offset = stats['local_sum'] / n_samples - global_mean
+                global_proj += n_samples * np.outer(offset, offset @ Q)
+        
+        return {
+            'mean': global_mean,
+            'proj': global_proj,
+            'n_samples': total_samples
+        }
+    
+    def _fit_sketch(self, X_nodes):
+        """
+        Compute the top eigenpairs of the global covariance from sketches.
+        
+        The server keeps an orthonormal (n_features, d) basis Q. In each
+        round every node returns X_i^T X_i Q, the server forms C Q for the
+        centered global covariance C and re-orthonormalizes it. One last
+        round provides the small d x d matrix Q^T C Q, whose
+        eigendecomposition (Rayleigh-Ritz) gives the result.
         
-        # Keep only n_components if specified
+        Parameters
+        ----------
+        X_nodes : list of ndarray
+            Data on each node
+            
+        Returns
+        -------
+        eigenvalues : ndarray
+            Eigenvalues in descending order
+        eigenvectors : ndarray
+            Corresponding eigenvectors, one per column
+        """
+        n_features = X_nodes[0].shape[1]
+        k = n_features
         if self.n_components is not None:
-            singular_values = singular_values[:self.n_components]
-            eigenvectors = eigenvectors[:, :self.n_components]
+            k = min(self.n_components, n_features)
+        n_sketch = min(k + 10, n_features)
+        
+        # Random Gaussian sketch shared by all nodes, optionally warm
+        # started from init_V
+        rng = np.random.default_rng(self.random_state)
+        if self.init_V is None:
+            Q = rng.standard_normal((n_features, n_sketch))
+        else:
+            init_V = np.asarray(self.init_V)
+            if init_V.ndim != 2 or init_V.shape[0] != n_features:
+                raise ValueError(
+                    f"init_V must have shape ({n_features}, j), "
+                    f"got {init_V.shape}."
+                )
+            n_random = max(n_sketch - init_V.shape[1], 0)
+            Q = np.hstack([init_V,
+                           rng.standard_normal((n_features, n_random))])
+        Q, _ = qr(Q.astype(np.float64), mode='economic')
+        
+        # The server works in float64; nodes apply Q in their own dtype.
+        # One thread pool serves all rounds
+        with partition_executor(X_nodes) as executor:
+            nodes = map_partitions(self._prepare_sketch_node, X_nodes,
+                                   executor)
+            
+            # Subspace iteration rounds, plus a final round for
+            # Rayleigh-Ritz
+            for i in range(max(1, self.n_iterations) + 1):
+                if i > 0:
+                    Q, _ = qr(global_stats['proj'], mode='economic')
+                local_stats = map_partitions(
+                    lambda node: self._compute_local_sketch(node, Q), nodes,
+                    executor
+                )
+                global_stats = self._aggregate_sketch(local_stats, Q)
+        
+        self.mean_ = global_stats['mean'].astype(self.dtype)
+        
+        # Rayleigh-Ritz: eigendecomposition of the small matrix Q^T C Q
+        T = Q.T @ global_stats['proj']
+        eigenvalues, W = eigh((T + T.T) / 2)
+        
+        eigenvalues = eigenvalues[::-1][:k].astype(self.dtype)
+        eigenvectors = (Q @ W[:, ::-1][:, :k]).astype(self.dtype)
+        
+        return eigenvalues, eigenvectors
+    
+    def fit(self, X_nodes, out_U=None, skip_U=False, compute_uv=True):
+        """
+        Fit the Federated SVD model.
+        
+        Parameters
+        ----------
+        X_nodes : list of array-like
+            List of data on each node, each of shape (n_samples_i, n_features).
+            Data remains on each node and only statistics are aggregated.
+        out_U : array-like, optional (default=None)
+            Preallocated output for U_ of shape (n_samples, n_components),
+            e.g. a np.memmap or an HDF5 dataset for data larger than
+            memory. U_ is written into it block by block.
+        skip_U : bool, optional (default=False)
+            If True, U_ is not computed and is left as None. Use this when
+            only s_ and Vt_ are needed.
+        compute_uv : bool, optional (default=True)
+            If False, only the singular values s_ are computed (e.g. for
+            explained_variance_ratio); U_, Vt_ and V_ are left as None and
+            the model cannot transform data.
+            
+        Returns
+        -------
+        self : object
+            Returns self
+        """
+        check_backend(self.backend)
+        if self.method not in ('covariance', 'sketch'):
+            raise ValueError(
+                f"method must be 'covariance' or 'sketch', got {self.method!r}."
+            )
+        if self.init_V is not None and self.method != 'sketch':
+            raise ValueError("init_V is only used with method='sketch'.")
+        
+        X_nodes = [np.asarray(X, dtype=self.dtype) for X in X_nodes]
+        
+        if self.method == 'sketch':
+            eigenvalues, eigenvectors = self._fit_sketch(X_nodes)
+        else:
+            eigenvalues, eigenvectors = self._fit_covariance(X_nodes,
+                                                             compute_uv)
+        
+        # Singular values are square roots of eigenvalues
+        singular_values = np.sqrt(np.maximum(eigenvalues, 0))
         
         self.s_ = singular_values
-        self.Vt_ = eigenvectors.T
+        if not compute_uv:
+            self.U_ = self.Vt_ = self.V_ = self.mean_proj_ = None
+            return self
         
-        # Step 4: Compute U from all data (in practice, this would be done locally)
-        # For demonstration, we concatenate data (in real federated learning,
-        # each node would compute its portion of U locally)
-        X_full = np.vstack([np.asarray(X) for X in X_nodes])
-        X_centered = X_full - self.mean_
+        self.Vt_ = np.ascontiguousarray(eigenvectors.T)
+        self.V_ = np.ascontiguousarray(eigenvectors)
+        self.mean_proj_ = self.mean_ @ self.V_
         
-        # U = X V S^-1
-        self.U_ = X_centered @ eigenvectors / singular_values
+        # Step 4: Compute U = X V S^-1 node by node (each node computes its
+        # own rows of U locally; nothing is concatenated)
+        self.U_ = None
+        if not skip_U:
+            self.U_ = compute_U(self.transform, X_nodes, self.s_, self.dtype,
+                                out=out_U)
         
         return self
     
@@ -175,11 +485,10 @@ class FederatedSVD:
         X_transformed : ndarray, shape (n_samples, n_components)
             Transformed data
         """
-        X = np.asarray(X)
-        X_centered = X - self.mean_
+        X = np.asarray(X, dtype=self.dtype)
         
-        # Project onto right singular vectors
-        X_transformed = X_centered @ self.Vt_.T
+        # Project onto the right singular vectors
+        X_transformed = center_project(X, self.V_, self.mean_, self.mean_proj_)
         
         return X_transformed
     
@@ -199,9 +508,19 @@ class FederatedSVD:
         """
         self.fit(X_nodes)
         
-        # Transform all nodes and concatenate
-        X_full = np.vstack([np.asarray(X) for X in X_nodes])
-        return self.transform(X_full)
+        # U_ holds the centered projections scaled by 1 / s_, so the
+        # training data does not need to be projected a second time.
+        # U_ is zero for null components of rank-deficient data; those
+        # columns are filled with a direct projection
+        X_transformed = self.U_ * self.s_
+        
+        null = self.s_ == 0
+        if np.any(null):
+            X_full = np.vstack([np.asarray(X, dtype=self.dtype)
+                                for X in X_nodes])
+            X_transformed[:, null] = self.transform(X_full)[:, null]
+        
+        return X_transformed
     
     def inverse_transform(self, X_transformed):
         """
@@ -217,10 +536,10 @@ class FederatedSVD:
         X : ndarray, shape (n_samples, n_features)
             Data in original space
         """
-        X_transformed = np.asarray(X_transformed)
+        X_transformed = np.asarray(X_transformed, dtype=self.dtype)
         
-        # Project back using Vt
-        X = X_transformed @ self.Vt_ + self.mean_
+        # Project back using Vt, adding the mean inside the same GEMM
+        X = gemm_bias(X_transformed, self.Vt_, self.mean_)
         
         return X
     
@@ -251,9 +570,14 @@ class FederatedSVD:
         info : dict
             Dictionary with privacy-related information
         """
+        if self.method == 'sketch':
+            data_sharing = 'Only aggregated statistics (mean, sketched covariance)'
+        else:
+            data_sharing = 'Only aggregated statistics (mean, covariance)'
+        
         return {
             'method': 'Federated Learning',
-            'data_sharing': 'Only aggregated statistics (mean, covariance)',
+            'data_sharing': data_sharing,
             'raw_data_shared': False,
             'privacy_level': 'High - raw data never leaves local nodes'
         }
@@ -9,6 +9,8 @@ prediction.
 import numpy as np
 from scipy.linalg import svd
 
+from ._linalg import center_project
+
 
 class SVDEmbeddingRegression:
     """
@@ -21,6 +23,10 @@ class SVDEmbeddingRegression:
     ----------
     n_components : int, optional (default=None)
         Number of singular values to keep. If None, all components are kept.
+    dtype : data-type, optional (default=np.float64)
+        Floating point type used for the computation and the fitted
+        attributes. np.float32 is about twice as fast when its precision
+        is sufficient.
     
     Attributes
     ----------
@@ -30,15 +36,23 @@ class SVDEmbeddingRegression:
         Singular values
     Vt_ : ndarray
         Right singular vectors (transposed)
+    V_ : ndarray
+        Contiguous copy of Vt_.T, used to project data
+    mean_X_proj_ : ndarray
+        Projection of the mean of X onto V_, used to center projected
+        float64 data
     weights_ : ndarray
         Regression coefficients in the reduced space
     """
     
-    def __init__(self, n_components=None):
+    def __init__(self, n_components=None, dtype=np.float64):
         self.n_components = n_components
+        self.dtype = dtype
         self.U_ = None
         self.s_ = None
         self.Vt_ = None
+        self.V_ = None
+        self.mean_X_proj_ = None
         self.weights_ = None
         self.mean_X_ = None
         self.mean_y_ = None
@@ -59,18 +73,19 @@ class SVDEmbeddingRegression:
         self : object
             Returns self
         """
-        X = np.asarray(X)
-        y = np.asarray(y)
+        X = np.asarray(X, dtype=self.dtype)
+        y = np.asarray(y, dtype=self.dtype)
         
-        # Center the data
-        self.mean_X_ = np.mean(X, axis=0)
-        self.mean_y_ = np.mean(y, axis=0) if y.ndim > 1 else np.mean(y)
+        # Center the data (means are accumulated in float64 for accuracy)
+        self.mean_X_ = np.mean(X, axis=0, dtype=np.float64).astype(self.dtype)
+        self.mean_y_ = np.mean(y, axis=0, dtype=np.float64).astype(self.dtype)
         
         X_centered = X - self.mean_X_
         y_centered = y - self.mean_y_
         
-        # Perform SVD
-        self.U_, self.s_, self.Vt_ = svd(X_centered, full_matrices=False)
+        # Perform SVD (X_centered is not needed afterwards)
+        self.U_, self.s_, self.Vt_ = svd(X_centered, full_matrices=False,
+                                         overwrite_a=True)
         
         # Keep only n_components if specified
         if self.n_components is not None:
@@ -78,16 +93,21 @@ class SVDEmbeddingRegression:
             self.s_ = self.s_[:self.n_components]
             self.Vt_ = self.Vt_[:self.n_components, :]
         
-        # Project X onto the reduced space (principal components)
-        # We use the projection onto the right singular vectors (Vt)
-        X_reduced = self.U_ @ np.diag(self.s_) @ self.Vt_
-        # Actually, for regression we want to work in the PC space directly
-        # X_centered @ Vt.T gives us the principal component scores
-        X_reduced = X_centered @ self.Vt_.T
-        
-        # Fit linear regression in the reduced space
-        # weights = (X^T X)^-1 X^T y
-        self.weights_ = np.linalg.lstsq(X_reduced, y_centered, rcond=None)[0]
+        self.Vt_ = np.ascontiguousarray(self.Vt_)
+        self.V_ = np.ascontiguousarray(self.Vt_.T)
+        self.mean_X_proj_ = self.mean_X_ @ self.V_
+        
+        # Fit linear regression in the reduced space (principal components)
+        # The scores X_centered @ V are U diag(s), so the normal equations
+        # are diagonal: weights = diag(1/s) U^T y
+        # As in lstsq, components below the rcond cutoff are dropped
+        eps = np.finfo(self.s_.dtype).eps
+        cutoff = eps * max(X.shape[0], len(self.s_)) * self.s_.max(initial=0)
+        s_inv = np.zeros_like(self.s_)
+        np.divide(1, self.s_, out=s_inv, where=self.s_ > cutoff)
+        if y_centered.ndim > 1:
+            s_inv = s_inv[:, None]
+        self.weights_ = s_inv * (self.U_.T @ y_centered)
         
         return self
     
@@ -105,11 +125,10 @@ class SVDEmbeddingRegression:
         X_transformed : ndarray, shape (n_samples, n_components)
             Transformed data
         """
-        X = np.asarray(X)
-        X_centered = X - self.mean_X_
+        X = np.asarray(X, dtype=self.dtype)
         
-        # Project onto the right singular vectors and scale by singular values
-        X_transformed = X_centered @ self.Vt_.T
+        # Project onto the right singular vectors
+        X_transformed = center_project(X, self.V_, self.mean_X_, self.mean_X_proj_)
         
         return X_transformed
     
@@ -127,11 +146,8 @@ class SVDEmbeddingRegression:
         y_pred : ndarray, shape (n_samples,) or (n_samples, n_targets)
             Predicted values
         """
-        X = np.asarray(X)
-        X_centered = X - self.mean_X_
-        
         # Project onto the principal components (right singular vectors)
-        X_reduced = X_centered @ self.Vt_.T
+        X_reduced = self.transform(X)
         
         # Apply regression weights
         y_pred = X_reduced @ self.weights_ + self.mean_y_
@@ -155,7 +171,10 @@ class SVDEmbeddingRegression:
             Transformed training data
         """
         self.fit(X, y)
-        return self.transform(X)
+        
+        # The centered training data is U diag(s) Vt, so its projection
+        # onto V is U diag(s) and needs no further matrix product
+        return self.U_ * self.s_
     
     def score(self, X, y):
         """
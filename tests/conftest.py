@@ -0,0 +1,112 @@
+"""Shared fixtures for the test suite"""
+
+import zlib
+
+import numpy as np
+import pytest
+
+import ser
+
+
+@pytest.fixture(scope="session")
+def rng():
+    """Seeded random number generator shared by the session fixtures"""
+    return np.random.default_rng(0)
+
+
+# Number of float32 samples drawn for the whole session. Each consumer
+# reads up to half of it, starting at an offset derived from its name
+POOL_SIZE = 1 << 15
+
+
+@pytest.fixture(scope="session")
+def pool(rng):
+    """Read-only float32 standard normal samples shared by all tests"""
+    pool = rng.standard_normal(POOL_SIZE, dtype=np.float32)
+    pool.setflags(write=False)
+    return pool
+
+
+def _sampler(pool, key):
+    """
+    Helper returning consecutive samples of the pool as views.
+    
+    The first view starts at an offset derived from key, so the data a
+    consumer gets does not depend on which tests ran before it, on the
+    same worker or at all.
+    """
+    offset = [zlib.crc32(key.encode()) % (POOL_SIZE // 2)]
+    end = offset[0] + POOL_SIZE // 2
+    
+    def take(shape):
+        n = int(np.prod(shape))
+        if offset[0] + n > end:
+            raise RuntimeError("Sample pool exhausted; increase POOL_SIZE.")
+        view = pool[offset[0]:offset[0] + n].reshape(shape)
+        offset[0] += n
+        return view
+    return take
+
+
+@pytest.fixture
+def take(pool, request):
+    """Helper returning samples of the pool determined by the test's id"""
+    return _sampler(pool, request.node.nodeid)
+
+
+# The estimator classes are injected as fixtures so that ser is imported
+# once here, rather than by every test module
+
+
+@pytest.fixture(scope="session")
+def DistributedSVD():
+    """The DistributedSVD estimator class"""
+    return ser.DistributedSVD
+
+
+@pytest.fixture(scope="session")
+def FederatedSVD():
+    """The FederatedSVD estimator class"""
+    return ser.FederatedSVD
+
+
+@pytest.fixture(scope="session")
+def SVDEmbeddingRegression():
+    """The SVDEmbeddingRegression estimator class"""
+    return ser.SVDEmbeddingRegression
+
+
+@pytest.fixture(scope="session")
+def fitted_fedsvd(FederatedSVD, pool):
+    """Federated SVD fitted once on two nodes, shared across tests"""
+    take = _sampler(pool, "fitted_fedsvd")
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    model = FederatedSVD(n_components=5)
+    model.fit([X1, X2])
+    
+    return model, (X1, X2)
+
+
+@pytest.fixture(scope="session")
+def fed_Xtest(pool, fitted_fedsvd):
+    """Held-out data and its projection by the shared Federated SVD"""
+    take = _sampler(pool, "fed_Xtest")
+    model, _ = fitted_fedsvd
+    X = take((10, 10))
+    
+    return X, model.transform(X)
+
+
+@pytest.fixture(scope="session")
+def fitted_ser(SVDEmbeddingRegression, pool):
+    """SER model fitted once with fit_transform, shared across tests"""
+    take = _sampler(pool, "fitted_ser")
+    X = take((50, 10))
+    y = take(50)
+    
+    model = SVDEmbeddingRegression(n_components=5)
+    X_transformed = model.fit_transform(X, y)
+    
+    return model, X, y, X_transformed
@@ -2,14 +2,13 @@
 
 import numpy as np
 import pytest
-from ser import DistributedSVD
 
 
-def test_distributed_svd_basic_fit():
+def test_distributed_svd_basic_fit(DistributedSVD, take):
     """Test basic fitting of Distributed SVD"""
-    X1 = np.random.randn(30, 10)
-    X2 = np.random.randn(20, 10)
-    X3 = np.random.randn(25, 10)
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    X3 = take((25, 10))
     
     model = DistributedSVD(n_components=5)
     model.fit([X1, X2, X3])
@@ -20,39 +19,117 @@ def test_distributed_svd_basic_fit():
     assert len(model.s_) == 5
 
 
-def test_distributed_svd_transform():
+def test_distributed_svd_exact(DistributedSVD, take):
+    """Test that the full decomposition matches an SVD of the pooled data"""
+    X_parts = [take((30, 10)), take((20, 10)), take((25, 10))]
+    
+    model = DistributedSVD(n_components=None)
+    model.fit(X_parts)
+    
+    X = np.vstack(X_parts).astype(np.float64)
+    _, s, Vt = np.linalg.svd(X - X.mean(axis=0), full_matrices=False)
+    
+    np.testing.assert_allclose(model.s_, s, rtol=1e-10)
+    # Singular vectors are defined up to sign
+    signs = np.sign(np.sum(model.Vt_ * Vt, axis=1))
+    np.testing.assert_allclose(model.Vt_, signs[:, None] * Vt, atol=1e-10)
+
+
+def test_distributed_svd_truncated(DistributedSVD, take):
+    """Test that truncation keeps the leading exact components"""
+    # A flat spectrum, where truncating the partitions would be inaccurate
+    X_parts = [take((m, 20)) for m in (40, 30, 8)]
+    
+    model = DistributedSVD(n_components=5)
+    model.fit(X_parts)
+    
+    X = np.vstack(X_parts).astype(np.float64)
+    _, s, Vt = np.linalg.svd(X - X.mean(axis=0), full_matrices=False)
+    
+    np.testing.assert_allclose(model.s_, s[:5], rtol=1e-10)
+    # Singular vectors are defined up to sign
+    np.testing.assert_allclose(np.abs(np.sum(model.Vt_ * Vt[:5], axis=1)),
+                               1, rtol=1e-10)
+    np.testing.assert_allclose(model.U_.T @ model.U_, np.eye(5), atol=1e-10)
+
+
+def test_distributed_svd_randomized(DistributedSVD, take):
+    """Test the randomized solver on low-rank plus noise data"""
+    V = take((3, 20))
+    X_parts = [take((m, 3)) @ V + 0.01 * take((m, 20)) for m in (40, 30, 8)]
+    
+    model = DistributedSVD(n_components=3, svd_solver='randomized',
+                           random_state=0)
+    model.fit(X_parts)
+    
+    X = np.vstack(X_parts).astype(np.float64)
+    _, s, Vt = np.linalg.svd(X - X.mean(axis=0), full_matrices=False)
+    
+    np.testing.assert_allclose(model.s_, s[:3], rtol=1e-6)
+    # Singular vectors are defined up to sign
+    np.testing.assert_allclose(np.abs(np.sum(model.Vt_ * Vt[:3], axis=1)),
+                               1, rtol=1e-6)
+
+
+def test_distributed_svd_invalid_solver(DistributedSVD, take):
+    """Test that an unknown svd_solver is rejected"""
+    model = DistributedSVD(n_components=5, svd_solver='arpack')
+    
+    with pytest.raises(ValueError):
+        model.fit([take((30, 10))])
+
+
+def test_distributed_svd_transform(DistributedSVD, take):
     """Test transformation with Distributed SVD"""
-    X1 = np.random.randn(30, 10)
-    X2 = np.random.randn(20, 10)
+    X1 = take((30, 10))
+    X2 = take((20, 10))
     
     model = DistributedSVD(n_components=5)
     model.fit([X1, X2])
     
-    X_test = np.random.randn(10, 10)
+    X_test = take((10, 10))
     X_transformed = model.transform(X_test)
     
     assert X_transformed.shape == (10, 5)
 
 
-def test_distributed_svd_inverse_transform():
+def test_distributed_svd_inverse_transform(DistributedSVD, take):
     """Test inverse transformation"""
-    X1 = np.random.randn(30, 10)
-    X2 = np.random.randn(20, 10)
+    X1 = take((30, 10))
+    X2 = take((20, 10))
     
     model = DistributedSVD(n_components=5)
     model.fit([X1, X2])
     
-    X_test = np.random.randn(10, 10)
+    X_test = take((10, 10))
     X_transformed = model.transform(X_test)
     X_reconstructed = model.inverse_transform(X_transformed)
     
     assert X_reconstructed.shape == X_test.shape
 
 
-def test_distributed_svd_explained_variance():
+def test_distributed_svd_inverse_transform_shapes(DistributedSVD, take):
+    """Test inverse transformation of a single sample and of no samples"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    model = DistributedSVD(n_components=5)
+    model.fit([X1, X2])
+    
+    x_t = model.transform(X1[:1])
+    
+    x = model.inverse_transform(x_t[0])
+    assert x.shape == (10,)
+    np.testing.assert_allclose(x, model.inverse_transform(x_t)[0])
+    
+    X_empty = model.inverse_transform(np.empty((0, 5)))
+    assert X_empty.shape == (0, 10)
+
+
+def test_distributed_svd_explained_variance(DistributedSVD, take):
     """Test explained variance ratio"""
-    X1 = np.random.randn(50, 10)
-    X2 = np.random.randn(50, 10)
+    X1 = take((50, 10))
+    X2 = take((50, 10))
     
     model = DistributedSVD(n_components=5)
     model.fit([X1, X2])
@@ -66,9 +143,9 @@ def test_distributed_svd_explained_variance():
     assert np.all(np.diff(variance_ratio) <= 0)
 
 
-def test_distributed_svd_single_partition():
+def test_distributed_svd_single_partition(DistributedSVD, take):
     """Test with single partition (edge case)"""
-    X = np.random.randn(50, 10)
+    X = take((50, 10))
     
     model = DistributedSVD(n_components=5)
     model.fit([X])
@@ -77,12 +154,69 @@ def test_distributed_svd_single_partition():
     assert len(model.s_) == 5
 
 
-def test_distributed_svd_fit_transform():
+def test_distributed_svd_fit_transform(DistributedSVD, take):
     """Test fit_transform method"""
-    X1 = np.random.randn(30, 10)
-    X2 = np.random.randn(20, 10)
+    X1 = take((30, 10))
+    X2 = take((20, 10))
     
     model = DistributedSVD(n_components=5)
     X_transformed = model.fit_transform([X1, X2])
     
     assert X_transformed.shape == (50, 5)
+    np.testing.assert_allclose(X_transformed,
+                               model.transform(np.vstack([X1, X2])),
+                               atol=1e-10)
+
+
+def test_distributed_svd_invalid_backend(DistributedSVD, take):
+    """Test that an unknown backend is rejected"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    model = DistributedSVD(n_components=5, backend='tpu')
+    
+    with pytest.raises(ValueError):
+        model.fit([X1, X2])
+
+
+def test_distributed_svd_float32(DistributedSVD, take):
+    """Test fitting in single precision"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    model = DistributedSVD(n_components=5, dtype=np.float32)
+    X_transformed = model.fit_transform([X1, X2])
+    
+    assert model.mean_.dtype == np.float32
+    assert model.s_.dtype == np.float32
+    assert model.Vt_.dtype == np.float32
+    assert model.U_.dtype == np.float32
+    assert X_transformed.dtype == np.float32
+
+
+def test_distributed_svd_out_U(DistributedSVD, tmp_path, take):
+    """Test writing U into a preallocated memory-mapped array"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    out_U = np.memmap(tmp_path / "U.dat", dtype=np.float64, mode="w+",
+                      shape=(50, 5))
+    model = DistributedSVD(n_components=5)
+    model.fit([X1, X2], out_U=out_U)
+    
+    assert model.U_ is out_U
+    np.testing.assert_allclose(
+        out_U * model.s_, model.transform(np.vstack([X1, X2]))
+    )
+
+
+def test_distributed_svd_skip_U(DistributedSVD, take):
+    """Test fitting without computing U"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    model = DistributedSVD(n_components=5)
+    model.fit([X1, X2], skip_U=True)
+    
+    assert model.U_ is None
+    assert model.Vt_.shape == (5, 10)
@@ -2,60 +2,61 @@
 
 import numpy as np
 import pytest
-from ser import FederatedSVD
 
 
-def test_federated_svd_basic_fit():
-    """Test basic fitting of Federated SVD"""
-    X1 = np.random.randn(30, 10)
-    X2 = np.random.randn(20, 10)
-    X3 = np.random.randn(25, 10)
-    
-    model = FederatedSVD(n_components=5)
-    model.fit([X1, X2, X3])
-    
-    assert model.U_ is not None
-    assert model.s_ is not None
-    assert model.Vt_ is not None
-    assert len(model.s_) == 5
-
-
-def test_federated_svd_transform():
-    """Test transformation with Federated SVD"""
-    X1 = np.random.randn(30, 10)
-    X2 = np.random.randn(20, 10)
+def test_federated_svd_outputs(FederatedSVD, fitted_fedsvd, fed_Xtest):
+    """Test fitted attributes, transform, inverse_transform and fit_transform"""
+    model, X_nodes = fitted_fedsvd
+    X_test, X_transformed = fed_Xtest
+    
+    # Fitted attributes
+    assert model.U_.shape == (50, 5)
+    assert model.s_.shape == (5,)
+    assert model.Vt_.shape == (5, 10)
+    
+    # transform / inverse_transform; reconstructions lie in the fitted
+    # subspace, so projecting them again gives back X_transformed
+    X_reconstructed = model.inverse_transform(X_transformed)
     
-    model = FederatedSVD(n_components=5)
-    model.fit([X1, X2])
+    assert X_transformed.shape == (10, 5)
+    assert X_reconstructed.shape == X_test.shape
+    np.testing.assert_allclose(model.transform(X_reconstructed),
+                               X_transformed, atol=1e-10)
     
-    X_test = np.random.randn(10, 10)
-    X_transformed = model.transform(X_test)
+    # fit_transform on a fresh model, so the shared one is not refitted
+    X_transformed = FederatedSVD(n_components=5).fit_transform(list(X_nodes))
     
-    assert X_transformed.shape == (10, 5)
+    assert X_transformed.shape == (50, 5)
+    np.testing.assert_allclose(X_transformed,
+                               model.transform(np.vstack(X_nodes)),
+                               atol=1e-10)
 
 
-def test_federated_svd_inverse_transform():
-    """Test inverse transformation"""
-    X1 = np.random.randn(30, 10)
-    X2 = np.random.randn(20, 10)
+def test_federated_svd_inverse_transform_shapes(FederatedSVD, take):
+    """Test inverse transformation of a single sample and of no samples"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
     
     model = FederatedSVD(n_components=5)
     model.fit([X1, X2])
     
-    X_test = np.random.randn(10, 10)
-    X_transformed = model.transform(X_test)
-    X_reconstructed = model.inverse_transform(X_transformed)
+    x_t = model.transform(X1[:1])
     
-    assert X_reconstructed.shape == X_test.shape
+    x = model.inverse_transform(x_t[0])
+    assert x.shape == (10,)
+    np.testing.assert_allclose(x, model.inverse_transform(x_t)[0])
+    
+    X_empty = model.inverse_transform(np.empty((0, 5)))
+    assert X_empty.shape == (0, 10)
 
 
-def test_federated_svd_explained_variance():
+def test_federated_svd_explained_variance(FederatedSVD, take):
     """Test explained variance ratio"""
-    X1 = np.random.randn(50, 10)
-    X2 = np.random.randn(50, 10)
+    X1 = take((50, 10))
+    X2 = take((50, 10))
     
     model = FederatedSVD(n_components=5)
-    model.fit([X1, X2])
+    model.fit([X1, X2], compute_uv=False)
     
     variance_ratio = model.explained_variance_ratio()
     
@@ -64,10 +65,50 @@ def test_federated_svd_explained_variance():
     assert np.all(variance_ratio <= 1)
 
 
-def test_federated_svd_privacy_info():
+def test_federated_svd_singular_values_only(FederatedSVD, fitted_fedsvd):
+    """Test fitting without singular vectors"""
+    fitted, X_nodes = fitted_fedsvd
+    
+    model = FederatedSVD(n_components=5)
+    model.fit(list(X_nodes), compute_uv=False)
+    
+    assert model.U_ is None
+    assert model.Vt_ is None
+    np.testing.assert_allclose(model.s_, fitted.s_, rtol=1e-10)
+
+
+def test_federated_svd_fit_transform_rank_deficient(FederatedSVD, take):
+    """Test fit_transform on rank-deficient data (7 samples, 10 features)"""
+    X1 = take((4, 10))
+    X2 = take((3, 10))
+    
+    model = FederatedSVD()
+    X_transformed = model.fit_transform([X1, X2])
+    
+    assert np.all(np.isfinite(model.U_))
+    assert np.all(np.isfinite(X_transformed))
+    np.testing.assert_allclose(X_transformed,
+                               model.transform(np.vstack([X1, X2])),
+                               atol=1e-10)
+
+
+def test_federated_svd_empty_node(FederatedSVD, take):
+    """Test that a node without samples does not change the fit"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    exact = FederatedSVD(n_components=5).fit([X1, X2])
+    model = FederatedSVD(n_components=5)
+    model.fit([X1, np.empty((0, 10), dtype=np.float32), X2])
+    
+    np.testing.assert_allclose(model.s_, exact.s_, rtol=1e-10)
+    assert model.U_.shape == (50, 5)
+
+
+def test_federated_svd_privacy_info(FederatedSVD, take):
     """Test privacy budget information"""
-    X1 = np.random.randn(30, 10)
-    X2 = np.random.randn(20, 10)
+    X1 = take((30, 10))
+    X2 = take((20, 10))
     
     model = FederatedSVD(n_components=5)
     model.fit([X1, X2])
@@ -79,24 +120,130 @@ def test_federated_svd_privacy_info():
     assert privacy_info['raw_data_shared'] == False
 
 
-def test_federated_svd_fit_transform():
-    """Test fit_transform method"""
-    X1 = np.random.randn(30, 10)
-    X2 = np.random.randn(20, 10)
+def test_federated_svd_iterations(FederatedSVD, fitted_fedsvd):
+    """Test with different number of iterations, warm started"""
+    fitted, X_nodes = fitted_fedsvd
     
-    model = FederatedSVD(n_components=5)
+    model = FederatedSVD(n_components=5, n_iterations=20, method='sketch',
+                         init_V=fitted.Vt_[:5].T)
+    model.fit(list(X_nodes))
+    
+    assert model.n_iterations == 20
+    np.testing.assert_allclose(model.s_, fitted.s_, rtol=1e-6)
+
+
+def test_federated_svd_invalid_backend(FederatedSVD, take):
+    """Test that an unknown backend is rejected"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    model = FederatedSVD(n_components=5, backend='tpu')
+    
+    with pytest.raises(ValueError):
+        model.fit([X1, X2])
+
+
+def test_federated_svd_float32(FederatedSVD, take):
+    """Test fitting in single precision"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    model = FederatedSVD(n_components=5, dtype=np.float32)
     X_transformed = model.fit_transform([X1, X2])
     
-    assert X_transformed.shape == (50, 5)
+    assert model.mean_.dtype == np.float32
+    assert model.s_.dtype == np.float32
+    assert model.Vt_.dtype == np.float32
+    assert model.U_.dtype == np.float32
+    assert X_transformed.dtype == np.float32
+
+
+def test_federated_svd_float32_accuracy(FederatedSVD, take):
+    """Test that float32 statistics are accumulated in double precision"""
+    # An offset mean makes the centering cancel most of the digits of X^T X
+    X1 = take((30, 10)) + np.float32(10)
+    X2 = take((20, 10)) + np.float32(10)
+    
+    exact = FederatedSVD(n_components=5).fit([X1, X2])
+    model = FederatedSVD(n_components=5, dtype=np.float32).fit([X1, X2])
+    
+    np.testing.assert_allclose(model.s_, exact.s_, rtol=1e-6)
+
+
+def test_federated_svd_out_U(FederatedSVD, tmp_path, take):
+    """Test writing U into a preallocated memory-mapped array"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    out_U = np.memmap(tmp_path / "U.dat", dtype=np.float64, mode="w+",
+                      shape=(50, 5))
+    model = FederatedSVD(n_components=5)
+    model.fit([X1, X2], out_U=out_U)
+    
+    assert model.U_ is out_U
+    np.testing.assert_allclose(
+        out_U * model.s_, model.transform(np.vstack([X1, X2]))
+    )
 
 
-def test_federated_svd_iterations():
-    """Test with different number of iterations"""
-    X1 = np.random.randn(30, 10)
-    X2 = np.random.randn(20, 10)
+def test_federated_svd_skip_U(FederatedSVD, take):
+    """Test fitting without computing U"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
     
-    model = FederatedSVD(n_components=5, n_iterations=20)
+    model = FederatedSVD(n_components=5)
+    model.fit([X1, X2], skip_U=True)
+    
+    assert model.U_ is None
+    assert model.Vt_.shape == (5, 10)
+
+
+def test_federated_svd_sketch(FederatedSVD, take):
+    """Test that the sketch method recovers the covariance solution"""
+    V = take((3, 20))
+    X1 = take((40, 3)) @ V + 0.01 * take((40, 20))
+    X2 = take((30, 3)) @ V + 0.01 * take((30, 20))
+    
+    exact = FederatedSVD(n_components=3).fit([X1, X2])
+    model = FederatedSVD(n_components=3, method='sketch', random_state=0)
     model.fit([X1, X2])
     
-    assert model.n_iterations == 20
-    assert model.s_ is not None
+    assert model.Vt_.shape == (3, 20)
+    np.testing.assert_allclose(model.s_, exact.s_, rtol=1e-6)
+
+
+def test_federated_svd_sketch_float32(FederatedSVD, take):
+    """Test that float32 sketches are centered without cancellation"""
+    V = take((3, 20))
+    X1 = take((40, 3)) @ V + 0.01 * take((40, 20)) + np.float32(100)
+    X2 = take((30, 3)) @ V + 0.01 * take((30, 20)) + np.float32(100)
+    
+    exact = FederatedSVD(n_components=3).fit([X1, X2])
+    model = FederatedSVD(n_components=3, method='sketch', random_state=0,
+                         dtype=np.float32)
+    model.fit([X1, X2])
+    
+    assert model.s_.dtype == np.float32
+    np.testing.assert_allclose(model.s_, exact.s_, rtol=1e-5)
+
+
+def test_federated_svd_invalid_method(FederatedSVD, take):
+    """Test that an unknown method is rejected"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    model = FederatedSVD(n_components=5, method='gossip')
+    
+    with pytest.raises(ValueError):
+        model.fit([X1, X2])
+
+
+def test_federated_svd_init_V_requires_sketch(FederatedSVD, take):
+    """Test that init_V is rejected by the covariance method"""
+    X1 = take((30, 10))
+    X2 = take((20, 10))
+    
+    model = FederatedSVD(n_components=2, init_V=np.zeros((4, 2)))
+    
+    with pytest.raises(ValueError):
+        model.fit([X1, X2])
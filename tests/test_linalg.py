@@ -0,0 +1,82 @@
+"""Tests for the shared linear algebra helpers"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from scipy.linalg import svd
+
+from ser._linalg import (center_project, gram_svd, local_statistics,
+                         map_partitions, partition_executor)
+
+
+def test_gram_svd(take):
+    """Test the Gram eigendecomposition against an SVD of a tall matrix"""
+    X = take((40, 6)).astype(np.float64)
+    
+    s, Vt = gram_svd(X)
+    _, s_exact, Vt_exact = svd(X, full_matrices=False)
+    
+    np.testing.assert_allclose(s, s_exact, rtol=1e-10)
+    # Singular vectors are defined up to sign
+    signs = np.sign(np.sum(Vt * Vt_exact, axis=1))
+    np.testing.assert_allclose(Vt, signs[:, None] * Vt_exact, atol=1e-10)
+    
+    # Truncation keeps the leading components
+    s_k, Vt_k = gram_svd(X, n_components=3)
+    np.testing.assert_allclose(s_k, s_exact[:3], rtol=1e-10)
+    np.testing.assert_allclose(np.abs(Vt_k), np.abs(Vt_exact[:3]), atol=1e-10)
+
+
+def test_gram_svd_ill_conditioned(take):
+    """Test that small singular values stay accurate"""
+    U, _ = np.linalg.qr(take((40, 10)).astype(np.float64))
+    V, _ = np.linalg.qr(take((10, 10)).astype(np.float64))
+    s_exact = np.logspace(0, -9, 10)
+    X = (U * s_exact) @ V.T
+    
+    s, _ = gram_svd(X)
+    
+    np.testing.assert_allclose(s, s_exact, rtol=1e-5)
+
+
+def test_local_statistics_float32(take):
+    """Test single precision statistics against a float64 reference"""
+    # Several row blocks, and an offset mean that would cancel digits
+    X = take((5000, 3)) + np.float32(100)
+    X64 = X.astype(np.float64)
+    
+    local_sum, local_scatter = local_statistics(X)
+    X_centered = X64 - X64.mean(axis=0)
+    
+    assert local_scatter.dtype == np.float64
+    np.testing.assert_allclose(local_sum, X64.sum(axis=0), rtol=1e-12)
+    np.testing.assert_allclose(np.triu(local_scatter),
+                               np.triu(X_centered.T @ X_centered),
+                               rtol=1e-5, atol=1e-2)
+
+
+def test_center_project_float32(take):
+    """Test that float32 projections do not cancel for a large mean"""
+    X = take((50, 10)) + np.float32(300)
+    V, _ = np.linalg.qr(take((10, 3)))
+    mean = X.mean(axis=0, dtype=np.float64).astype(np.float32)
+    
+    X_projected = center_project(X, V, mean, mean @ V)
+    expected = (X.astype(np.float64) - mean) @ V.astype(np.float64)
+    
+    assert X_projected.dtype == np.float32
+    np.testing.assert_allclose(X_projected, expected, rtol=1e-5, atol=1e-5)
+
+
+def test_map_partitions(take):
+    """Test serial and pooled processing of partitions"""
+    partitions = [take((30, 10)), take((20, 10))]
+    expected = [X.sum() for X in partitions]
+    
+    # Small inputs do not start a thread pool
+    with partition_executor(partitions) as executor:
+        assert executor is None
+        assert map_partitions(np.sum, partitions, executor) == expected
+    
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        assert map_partitions(np.sum, partitions, executor) == expected
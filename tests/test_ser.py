@@ -2,55 +2,34 @@
 
 import numpy as np
 import pytest
-from ser import SVDEmbeddingRegression
 
 
-def test_ser_basic_fit():
-    """Test basic fitting of SER model"""
-    X = np.random.randn(50, 10)
-    y = np.random.randn(50)
-    
-    model = SVDEmbeddingRegression(n_components=5)
-    model.fit(X, y)
+def test_ser_outputs(fitted_ser):
+    """Test fitted attributes, predict, transform and fit_transform"""
+    model, X, y, X_transformed = fitted_ser
     
+    # Fitted attributes
     assert model.U_ is not None
     assert model.s_ is not None
     assert model.Vt_ is not None
     assert model.weights_ is not None
-
-
-def test_ser_predict():
-    """Test prediction with SER model"""
-    X = np.random.randn(50, 10)
-    y = np.random.randn(50)
-    
-    model = SVDEmbeddingRegression(n_components=5)
-    model.fit(X, y)
-    
-    y_pred = model.predict(X)
-    
-    assert y_pred.shape == y.shape
-
-
-def test_ser_transform():
-    """Test transformation with SER model"""
-    X = np.random.randn(50, 10)
-    y = np.random.randn(50)
     
-    model = SVDEmbeddingRegression(n_components=5)
-    model.fit(X, y)
-    
-    X_transformed = model.transform(X)
+    # predict
+    assert model.predict(X).shape == y.shape
     
+    # transform agrees with the output of fit_transform
     assert X_transformed.shape == (50, 5)
+    np.testing.assert_allclose(model.transform(X), X_transformed, atol=1e-10)
 
 
-def test_ser_score():
+def test_ser_score(SVDEmbeddingRegression):
     """Test scoring with SER model"""
-    # Create data with linear relationship
-    X = np.random.randn(100, 5)
-    true_weights = np.array([1.0, 2.0, -1.0, 0.5, -0.5])
-    y = X @ true_weights + 0.1 * np.random.randn(100)
+    # Create data with linear relationship; a dedicated seed keeps the
+    # score deterministic (R^2 is about 0.998 for this draw)
+    rng = np.random.default_rng(12345)
+    X = rng.standard_normal((40, 5), dtype=np.float32)
+    true_weights = np.array([1.0, 2.0, -1.0, 0.5, -0.5], dtype=np.float32)
+    y = X @ true_weights + 0.1 * rng.standard_normal(40, dtype=np.float32)
     
     model = SVDEmbeddingRegression(n_components=5)
     model.fit(X, y)
@@ -61,25 +40,43 @@ def test_ser_score():
     assert score > 0.9
 
 
-def test_ser_fit_transform():
-    """Test fit_transform method"""
-    X = np.random.randn(50, 10)
-    y = np.random.randn(50)
+def test_ser_weights_match_lstsq(SVDEmbeddingRegression, take):
+    """Test the closed-form weights against a least-squares solve"""
+    X = take((30, 6)).astype(np.float64)
+    X_rank_deficient = np.hstack([X[:, :4], X[:, :2]])
+    Y = take((30, 2))
     
-    model = SVDEmbeddingRegression(n_components=5)
-    X_transformed = model.fit_transform(X, y)
-    
-    assert X_transformed.shape == (50, 5)
-    assert model.U_ is not None
+    for X, y in [(X, Y[:, 0]), (X, Y), (X_rank_deficient, Y[:, 0])]:
+        model = SVDEmbeddingRegression(n_components=None)
+        model.fit(X, y)
+        
+        X_reduced = (X - model.mean_X_) @ model.V_
+        expected = np.linalg.lstsq(X_reduced, y - model.mean_y_,
+                                   rcond=None)[0]
+        
+        np.testing.assert_allclose(model.weights_, expected, atol=1e-10)
 
 
-def test_ser_n_components_none():
+def test_ser_n_components_none(SVDEmbeddingRegression, take):
     """Test SER with n_components=None"""
-    X = np.random.randn(50, 10)
-    y = np.random.randn(50)
+    X = take((50, 10))
+    y = take(50)
     
     model = SVDEmbeddingRegression(n_components=None)
     model.fit(X, y)
     
     # Should keep all components (min of dimensions)
     assert len(model.s_) == min(X.shape)
+
+
+def test_ser_float32(SVDEmbeddingRegression, take):
+    """Test fitting in single precision"""
+    X = take((50, 10))
+    y = take(50)
+    
+    model = SVDEmbeddingRegression(n_components=5, dtype=np.float32)
+    model.fit(X, y)
+    
+    assert model.Vt_.dtype == np.float32
+    assert model.weights_.dtype == np.float32
+    assert model.predict(X).dtype == np.float32